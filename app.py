@@ -1,66 +1,137 @@
+import re
 import streamlit as st
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+import requests_cache
+import lxml.etree
+import lxml.html
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-@st.cache_data
-def fetch_buffer_top17():
-    url = "https://buffer.com/resources/trending-audio-instagram/"
-    res = requests.get(url, headers={"User-Agent":"Mozilla/5.0"})
-    soup = BeautifulSoup(res.text, "html.parser")
+BUFFER_URL = "https://buffer.com/resources/trending-audio-instagram/"
+INDIA_URL = "https://blog.bosswallah.com/trending-songs-on-instagram-reels-today/"
 
-    header = soup.find("h2", string=lambda t: t and "17 Trending Sounds" in t)
-    if not header:
-        return pd.DataFrame()
-    songs = []
-    ul = header.find_next_sibling("ul")
-    if not ul:
+CACHE_TTL = 3600
+STALE_TTL = 24 * 3600
+# Kept short so a stale page served while revalidating isn't pinned for long.
+REFRESH_TTL = 60
+
+# Built once per process: Streamlit re-executes this script on every rerun.
+@st.cache_resource
+def _session():
+    session = requests_cache.CachedSession(
+        "scrape_cache",
+        backend="sqlite",
+        expire_after=CACHE_TTL,
+        stale_while_revalidate=STALE_TTL,
+        stale_if_error=True,
+    )
+    session.headers.update({"User-Agent": "Mozilla/5.0"})
+    # Connect errors only: retrying read timeouts would multiply a hung origin's wait.
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, read=0, backoff_factor=0.2),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+_BUFFER_ITEMS = lxml.etree.XPath(
+    '((//h2[contains(., "17 Trending Sounds")])[1]/following-sibling::ul[1]//li)[position() <= 17]'
+)
+_INDIA_ITEMS = lxml.etree.XPath("((//ol)[1]//li)[position() <= 10]")
+# "Song" – Artist • 1,200+ Reels
+_INDIA_ITEM_RE = re.compile(
+    r'"*(?P<song>[^–]*?)"*\s*'
+    r'(?:–\s*(?:(?P<artist>[^–•]*?)\s*•)?[^–\d]*(?P<reels>\d[\d,]*\+?)?|$)'
+)
+
+def _text(el, sep=""):
+    return sep.join(s.strip() for s in el.itertext() if s.strip())
+
+def _parse(content, encoding=None):
+    # Built per call: lxml parsers are not thread-safe.
+    try:
+        parser = lxml.html.HTMLParser(
+            encoding=encoding, remove_comments=True, remove_pis=True, collect_ids=False
+        )
+    except LookupError:
+        # A header charset libxml2 doesn't know: let it sniff the page instead.
+        return _parse(content)
+    try:
+        return lxml.html.fromstring(content, parser=parser)
+    except lxml.etree.ParserError:
+        # Blank document: treat it as a page without the list.
+        return None
+
+def _download(session, url):
+    # A failed request parses as a blank page, so only that site's table is lost.
+    try:
+        res = session.get(url, timeout=10)
+    except requests.RequestException:
+        return b"", None
+    # libxml2 only sees <meta charset>, so pass on a charset from the header.
+    has_charset = "charset" in res.headers.get("Content-Type", "").lower()
+    return res.content, res.encoding if has_charset else None
+
+def _scrape(session, url, parse):
+    return parse(*_download(session, url))
+
+def parse_buffer_top17(content, encoding=None):
+    tree = _parse(content, encoding)
+    if tree is None:
         return pd.DataFrame()
-    for li in ul.find_all("li", limit=17):
-        text = li.get_text(separator=" ", strip=True)
-        title = text.split("–")[0].split(". ",1)[-1]
-        desc = li.find("p")
-        desc_text = desc.get_text(strip=True) if desc else ""
-        songs.append({"Song": title, "Details": desc_text})
-    return pd.DataFrame(songs)
-
-@st.cache_data
-def fetch_india_top10():
-    url = "https://blog.bosswallah.com/trending-songs-on-instagram-reels-today/"
-    res = requests.get(url, headers={"User-Agent":"Mozilla/5.0"})
-    soup = BeautifulSoup(res.text, "html.parser")
-
-    # Get the first ordered list
-    ol = soup.find("ol")
-    if not ol:
+
+    titles, details = [], []
+    for li in _BUFFER_ITEMS(tree):
+        text = _text(li, " ")
+        titles.append(text.split("–")[0].split(". ",1)[-1])
+        desc = li.find(".//p")
+        details.append(_text(desc) if desc is not None else "")
+    return pd.DataFrame({"Song": titles, "Details": details})
+
+def parse_india_top10(content, encoding=None):
+    tree = _parse(content, encoding)
+    if tree is None:
         return pd.DataFrame()
 
-    songs = []
-    for li in ol.find_all("li", limit=10):
-        raw = li.get_text(separator=" ", strip=True)
-        parts = raw.split("–")
-        song = parts[0].strip().strip('"')
-        rest = parts[1] if len(parts) > 1 else ""
-        artist = rest.split("•")[0].strip() if "•" in rest else ""
-        reels = ''.join([c for c in rest if c.isdigit() or c in "+,"]) or ""
-        songs.append({
-            "Song": song,
-            "Artist": artist,
-            "Reels Used": reels
-        })
-    return pd.DataFrame(songs)
+    # Items of the first ordered list
+    songs, artists, reels = [], [], []
+    for li in _INDIA_ITEMS(tree):
+        m = _INDIA_ITEM_RE.match(_text(li, " "))
+        songs.append(m["song"])
+        artists.append(m["artist"] or "")
+        reels.append(m["reels"] or "")
+    return pd.DataFrame({
+        "Song": songs,
+        "Artist": artists,
+        "Reels Used": reels
+    })
+
+# The frames are never mutated, so they are shared rather than copied per rerun.
+@st.cache_resource(ttl=REFRESH_TTL)
+def fetch_all():
+    session = _session()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        return tuple(pool.map(
+            partial(_scrape, session),
+            [BUFFER_URL, INDIA_URL],
+            [parse_buffer_top17, parse_india_top10],
+        ))
 
 st.set_page_config(page_title="Instagram Trending Audio", layout="wide")
 st.title("🎧 Instagram Trending Audio (Global + India)")
 
-df_glob = fetch_buffer_top17()
+df_glob, df_ind = fetch_all()
 if df_glob.empty:
     st.error("⚠️ Couldn't fetch Buffer's trending list.")
 else:
     st.header("🌍 Global (Top 17 via Buffer)")
     st.dataframe(df_glob, use_container_width=True)
 
-df_ind = fetch_india_top10()
 if df_ind.empty:
     st.error("⚠️ Couldn't fetch India trending list.")
 else:
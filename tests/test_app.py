@@ -0,0 +1,49 @@
+from pathlib import Path
+from unittest import mock
+
+import requests
+import requests_cache
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+APP = str(Path(__file__).resolve().parents[1] / "app.py")
+
+BUFFER_PAGE = """<html><head><meta charset="utf-8"></head><body>
+<h2>17 Trending Sounds</h2>
+<ul><li>1. Espresso – Sabrina Carpenter<p>Upbeat pop</p></li></ul>
+</body></html>"""
+
+INDIA_PAGE = """<html><head><meta charset="utf-8"></head><body>
+<ol><li>"Kesariya" – Arijit Singh • 1,200+ Reels</li></ol>
+</body></html>"""
+
+
+def _response(body, content_type):
+    res = requests.Response()
+    res.status_code = 200
+    res.headers["Content-Type"] = content_type
+    res.encoding = requests.utils.get_encoding_from_headers(res.headers)
+    res._content = body.encode()
+    return res
+
+
+def test_unknown_header_charset_falls_back_to_meta(tmp_path, monkeypatch):
+    # Keep the on-disk HTTP cache out of the checkout.
+    monkeypatch.chdir(tmp_path)
+    st.cache_resource.clear()
+    pages = {"buffer.com": BUFFER_PAGE, "bosswallah.com": INDIA_PAGE}
+
+    def fake_get(self, url, **kwargs):
+        body = next(page for host, page in pages.items() if host in url)
+        return _response(body, "text/html; charset=utf8mb4")
+
+    with mock.patch.object(requests_cache.CachedSession, "get", fake_get):
+        at = AppTest.from_file(APP).run()
+
+    assert not at.exception
+    assert not at.error
+    df_glob, df_ind = (d.value for d in at.dataframe)
+    assert len(df_glob) == 1
+    assert df_ind.to_dict("records") == [
+        {"Song": "Kesariya", "Artist": "Arijit Singh", "Reels Used": "1,200+"}
+    ]